@@ -0,0 +1,89 @@
+"""
+Tracks how long the bot's modules take to import, using `python -X importtime`.
+
+    python bench_startup.py [module ...] [--runs 5] [--top 8] [--max-ms 700]
+
+Each module (default: config, catalog, db, bot) is imported in a fresh interpreter `--runs`
+times after one warm-up run (which writes the .pyc files). The median cumulative import time
+is printed with the module's most expensive direct imports. With --max-ms the script exits 1
+when a module is slower than that, so a cold-start regression can fail a CI job. Importing
+the bot needs no network, so this runs anywhere.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = ('config', 'catalog', 'db', 'bot')
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_times(module: str):
+    """Imports `module` once under -X importtime. Returns [(depth, name, cumulative µs)] in report order."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=HERE, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((depth, name.strip(), int(cumulative)))
+    return rows
+
+
+def measure(module: str, runs: int):
+    """Returns (median cumulative ms, {direct import: median ms})."""
+    import_times(module)  # warm-up
+    totals = []
+    direct = {}
+    for _ in range(runs):
+        rows = import_times(module)
+        # A module's own imports are the rows right before it, up to the previous top-level row
+        end = max(i for i, (depth, name, _) in enumerate(rows) if depth == 0 and name == module)
+        start = end
+        while start > 0 and rows[start - 1][0] > 0:
+            start -= 1
+        totals.append(rows[end][2] / 1000)
+        for depth, name, cumulative in rows[start:end]:
+            if depth == 1:
+                direct.setdefault(name, []).append(cumulative / 1000)
+    return statistics.median(totals), {name: statistics.median(times) for name, times in direct.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the bot's import (cold start) time.")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8, help="direct imports listed per module")
+    parser.add_argument('--max-ms', type=float, help="fail when a module takes longer than this to import")
+    args = parser.parse_args()
+
+    too_slow = []
+    for module in args.modules:
+        try:
+            total, direct = measure(module, max(1, args.runs))
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 2
+        print(f"{module}: {total:.1f} ms")
+        for name, ms in sorted(direct.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {ms:8.1f} ms  {name}")
+        if args.max_ms is not None and total > args.max_ms:
+            too_slow.append(module)
+
+    if too_slow:
+        print(f"Slower than {args.max_ms:g} ms: {', '.join(too_slow)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
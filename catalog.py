@@ -0,0 +1,147 @@
+"""
+Product catalog for the packs sold by the bot.
+
+Products are loaded once from a JSON (or YAML) file into compact, immutable records and
+the price-list messages are rendered from the same data, so prices shown to users can't
+drift from the rates that are charged. The bot swaps in a freshly loaded Catalog on
+/reload_catalog.
+"""
+from decimal import Decimal, InvalidOperation
+from typing import NamedTuple, Optional
+import json
+import os
+
+REGIONS = ('ph', 'br')
+
+
+class CatalogError(ValueError):
+    """Raised when a catalog file can't be read or contains invalid products."""
+
+
+class Product(NamedTuple):
+    name: str
+    region: str
+    smile_ids: tuple  # Smile One product IDs, one createorder call each
+    rate_cents: int
+    non_revert: bool = False  # balance is NOT reverted when the order fails
+    section: Optional[str] = None
+
+
+def format_cents(cents: int) -> str:
+    """Renders integer cents as a decimal amount, e.g. 11690 -> "116.90" and -50 -> "-0.50"."""
+    sign = "-" if cents < 0 else ""
+    cents = abs(cents)
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+def parse_rate_cents(value) -> int:
+    """Parses a rate such as "116.90" or 116.9 into integer cents without float rounding."""
+    try:
+        cents = Decimal(str(value)) * 100
+    except InvalidOperation:
+        raise CatalogError(f"Invalid rate: {value!r}")
+    if cents != cents.to_integral_value() or cents <= 0:
+        raise CatalogError(f"Rate must be positive with at most 2 decimals: {value!r}")
+    return int(cents)
+
+
+class Catalog:
+    def __init__(self, data: dict):
+        self._products = {}
+        self._price_lists = {}
+        self._unit_rates = {}  # (region, smile_id) -> rate_cents of the cheapest single-ID product
+        for region in REGIONS:
+            region_data = data.get(region)
+            if not isinstance(region_data, dict):
+                raise CatalogError(f"Missing region '{region}'")
+            for section in region_data.get('sections', []):
+                for entry in section.get('products', []):
+                    product = self._make_product(region, section.get('title'), entry)
+                    if (region, product.name) in self._products:
+                        raise CatalogError(f"Duplicate product '{product.name}' in region '{region}'")
+                    self._products[(region, product.name)] = product
+                    if len(product.smile_ids) == 1:
+                        key = (region, product.smile_ids[0])
+                        self._unit_rates[key] = min(self._unit_rates.get(key, product.rate_cents), product.rate_cents)
+            self._price_lists[region] = self._render_price_list(region, region_data)
+
+    @staticmethod
+    def _make_product(region: str, section: Optional[str], entry: dict) -> Product:
+        try:
+            name = str(entry['name']).lower()
+            ids = entry['ids']
+            rate = entry['rate']
+        except (KeyError, TypeError):
+            raise CatalogError(f"Product entries need name, ids and rate: {entry!r}")
+        if isinstance(ids, (str, int)):
+            ids = [ids]
+        if not ids:
+            raise CatalogError(f"Product '{name}' has no Smile One IDs")
+        return Product(
+            name=name,
+            region=region,
+            smile_ids=tuple(str(pid) for pid in ids),
+            rate_cents=parse_rate_cents(rate),
+            non_revert=bool(entry.get('non_revert', False)),
+            section=section,
+        )
+
+    def _render_price_list(self, region: str, region_data: dict) -> str:
+        lines = [f"\n<b>{region_data.get('title', '')}</b>\n", f"<b>{region_data.get('heading', '')}</b>\n"]
+        for section in region_data.get('sections', []):
+            if section.get('title'):
+                lines.append(f"      {section['title']}\n")
+            for entry in section.get('products', []):
+                product = self._products[(region, str(entry['name']).lower())]
+                lines.append(f"    - {product.name}: {format_cents(product.rate_cents)}🪙")
+            lines.append("")
+        return "\n".join(lines).rstrip()
+
+    def get(self, region: str, name: str) -> Optional[Product]:
+        return self._products.get((region, name.lower()))
+
+    def products(self, region: str) -> list:
+        return [product for (product_region, _), product in self._products.items() if product_region == region]
+
+    def component_weights(self, product: Product) -> tuple:
+        """
+        Relative value of each Smile One ID in a bundle, taken from the single-ID product
+        selling that ID. Used to split a bundle's rate when only some components are delivered.
+        Falls back to equal weights when a component isn't sold on its own.
+        """
+        weights = tuple(self._unit_rates.get((product.region, pid)) for pid in product.smile_ids)
+        if None in weights:
+            return (1,) * len(product.smile_ids)
+        return weights
+
+    def price_list(self, region: str) -> str:
+        """Pre-rendered HTML price list for the region."""
+        return self._price_lists[region]
+
+    @classmethod
+    def load(cls, path: str) -> 'Catalog':
+        """Loads a catalog from a .json, .yaml or .yml file."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+        except OSError as e:
+            raise CatalogError(f"Could not read catalog {path}: {e}")
+
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise CatalogError("PyYAML is required to load YAML catalogs")
+            try:
+                data = yaml.safe_load(text)
+            except yaml.YAMLError as e:
+                raise CatalogError(f"Invalid YAML in catalog {path}: {e}")
+        else:
+            try:
+                data = json.loads(text)
+            except ValueError as e:
+                raise CatalogError(f"Invalid JSON in catalog {path}: {e}")
+
+        if not isinstance(data, dict):
+            raise CatalogError(f"Catalog {path} must contain a mapping of regions")
+        return cls(data)
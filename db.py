@@ -0,0 +1,64 @@
+"""
+MongoDB access for the bot.
+
+The client isn't created at import: connect() is called from the Application's post_init hook
+(or by a test with its own client), so importing the bot needs no network or DNS lookup. The
+collections below are stand-ins that forward to the real motor collections once connected.
+"""
+from datetime import timezone
+
+from config import MONGO_URI, MONGO_DB_NAME
+
+_client = None
+_database = None
+_collections = {}  # name -> motor collection, for the current connection
+
+
+class LazyCollection:
+    """A named collection handle, usable at import time; every attribute but `name` comes from the connected collection."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr):
+        collection = _collections.get(self.name)
+        if collection is None:
+            if _database is None:
+                raise RuntimeError(f"Database not connected (collection '{self.name}')")
+            collection = _collections[self.name] = _database[self.name]
+        return getattr(collection, attr)
+
+    def __repr__(self):
+        return f"LazyCollection({self.name!r})"
+
+
+users_collection = LazyCollection('user')  # user data
+order_collection = LazyCollection('order')  # order data for mlbb
+migrations_collection = LazyCollection('migrations')  # applied schema migrations
+order_attempts_collection = LazyCollection('order_attempts')  # one document per createorder call, keyed by its fingerprint
+daily_stats_collection = LazyCollection('daily_stats')  # per day/sender/region/product order totals for closed days
+daily_stats_days_collection = LazyCollection('daily_stats_days')  # days already rolled up into daily_stats
+user_summaries_collection = LazyCollection('user_summaries')  # per-sender order totals and recent orders, keyed by sender_user_id
+order_jobs_collection = LazyCollection('order_jobs')  # one durable job per bulk order line
+wallet_ledger_collection = LazyCollection('wallet_ledger')  # append-only: one entry per balance change
+wallet_snapshots_collection = LazyCollection('wallet_snapshots')  # periodic wallet balances at a ledger position
+
+
+def connect(client=None):
+    """Creates the Mongo client, or uses `client` (e.g. a mock in tests). Motor is only imported here."""
+    global _client, _database
+    if client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(MONGO_URI, tz_aware=True, tzinfo=timezone.utc)  # datetimes come back as aware UTC values
+    _client = client
+    _database = client[MONGO_DB_NAME]
+    _collections.clear()
+
+
+def close():
+    global _client, _database
+    if _client is not None:
+        _client.close()
+    _client = None
+    _database = None
+    _collections.clear()
@@ -0,0 +1,155 @@
+"""
+Local stand-in for the Smile One API, for load and integration testing without spending real
+Smile coins.
+
+    python fake_smile_one.py [--port 8090] [--latency 0.2] [--jitter 0.1] [--fail-rate 0.05] ...
+
+Serves /<region>/smilecoin/api/getrole, /createorder and /querypoints for the ph and br regions,
+and checks every request's sign the way Smile One does (double MD5 over the sorted parameters
+and KEY). Point the bot at it with:
+
+    SMILE_ONE_BASE_URL_PH=http://127.0.0.1:8090/ph SMILE_ONE_BASE_URL_BR=http://127.0.0.1:8090/br
+
+Latency, business failures, HTTP error statuses, dropped connections and hung requests are
+configurable. GET /stats returns request counts per endpoint and outcome.
+"""
+from collections import Counter
+from typing import NamedTuple
+from aiohttp import web
+import argparse
+import asyncio
+import hashlib
+import itertools
+import logging
+import random
+
+from config import UID, EMAIL, KEY
+
+REGIONS = ('ph', 'br')
+REQUIRED_PARAMS = {
+    'getrole': ('uid', 'email', 'userid', 'zoneid', 'product', 'productid', 'time', 'sign'),
+    'createorder': ('uid', 'email', 'userid', 'zoneid', 'product', 'productid', 'time', 'sign'),
+    'querypoints': ('uid', 'email', 'product', 'time', 'sign'),
+}
+
+logger = logging.getLogger(__name__)
+
+
+class FakeSettings(NamedTuple):
+    uid: str = UID
+    email: str = EMAIL
+    key: str = KEY
+    latency: float = 0.05  # seconds added to every response
+    jitter: float = 0.0  # up to this many extra seconds, uniformly random
+    fail_rate: float = 0.0  # createorder answered with a Smile One error (HTTP 200, status != 200)
+    invalid_role_rate: float = 0.0  # getrole answered "role not found"
+    http_error_rate: float = 0.0  # any endpoint answered with http_status
+    http_status: int = 503
+    drop_rate: float = 0.0  # connection closed without a response (outcome unknown to the bot)
+    hang_rate: float = 0.0  # response delayed by hang_seconds, past the bot's timeout
+    hang_seconds: float = 60.0
+    smile_points: int = 1000000
+    seed: int = None
+
+
+def smile_one_sign(params: dict, key: str) -> str:
+    """The sign Smile One expects: md5(md5("k1=v1&k2=v2...&KEY")) over the sorted parameters, without sign."""
+    query_string = '&'.join(f"{k}={v}" for k, v in sorted(params.items()) if k != 'sign')
+    query_string += f"&{key}"
+    return hashlib.md5(hashlib.md5(query_string.encode()).hexdigest().encode()).hexdigest()
+
+
+def build_fake_app(settings: FakeSettings) -> web.Application:
+    rng = random.Random(settings.seed)
+    order_ids = itertools.count(1)
+    stats = Counter()
+
+    async def api(request: web.Request):
+        region = request.match_info['region']
+        endpoint = request.match_info['endpoint']
+        if region not in REGIONS or endpoint not in REQUIRED_PARAMS:
+            raise web.HTTPNotFound()
+        params = dict(await request.post())
+        name = f"{region}/{endpoint}"
+        stats[f"{name} requests"] += 1
+
+        await asyncio.sleep(settings.latency + rng.uniform(0, settings.jitter))
+        roll = rng.random()
+        if roll < settings.drop_rate:
+            stats[f"{name} dropped"] += 1
+            request.transport.close()
+            return web.Response()  # never sent: the transport is gone
+        roll -= settings.drop_rate
+        if roll < settings.hang_rate:
+            stats[f"{name} hung"] += 1
+            await asyncio.sleep(settings.hang_seconds)
+        elif roll < settings.hang_rate + settings.http_error_rate:
+            stats[f"{name} http {settings.http_status}"] += 1
+            return web.json_response({"status": settings.http_status, "message": "Injected HTTP error"}, status=settings.http_status)
+
+        missing = [param for param in REQUIRED_PARAMS[endpoint] if not params.get(param)]
+        if missing:
+            stats[f"{name} bad request"] += 1
+            return web.json_response({"status": 400, "message": f"Missing parameters: {', '.join(missing)}"})
+        if params['uid'] != str(settings.uid) or params['email'] != str(settings.email):
+            stats[f"{name} bad account"] += 1
+            return web.json_response({"status": 401, "message": "Invalid uid or email"})
+        if params['sign'] != smile_one_sign(params, settings.key):
+            stats[f"{name} bad sign"] += 1
+            return web.json_response({"status": 401, "message": "Sign error"})
+
+        if endpoint == 'querypoints':
+            stats[f"{name} ok"] += 1
+            return web.json_response({"status": 200, "message": "success", "smile_points": str(settings.smile_points)})
+        if endpoint == 'getrole':
+            if rng.random() < settings.invalid_role_rate:
+                stats[f"{name} role not found"] += 1
+                return web.json_response({"status": 201, "message": "Role not found"})
+            stats[f"{name} ok"] += 1
+            return web.json_response({"status": 200, "message": "success", "username": f"Player{params['userid']}",
+                                      "zone": params['zoneid']})
+        if rng.random() < settings.fail_rate:
+            stats[f"{name} failed"] += 1
+            return web.json_response({"status": 400, "message": "Injected order failure"})
+        stats[f"{name} ok"] += 1
+        return web.json_response({"status": 200, "message": "success", "order_id": f"FAKE{region.upper()}{next(order_ids):08d}"})
+
+    async def show_stats(request: web.Request):
+        return web.json_response(dict(sorted(stats.items())))
+
+    app = web.Application()
+    app.router.add_post('/{region}/smilecoin/api/{endpoint}', api)
+    app.router.add_get('/stats', show_stats)
+    app['stats'] = stats
+    return app
+
+
+def main():
+    defaults = FakeSettings()
+    parser = argparse.ArgumentParser(description="Local stand-in for the Smile One API.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--uid', default=defaults.uid, help="expected uid (default: UID from bot.env)")
+    parser.add_argument('--email', default=defaults.email, help="expected email (default: EMAIL from bot.env)")
+    parser.add_argument('--key', default=defaults.key, help="signing key (default: KEY from bot.env)")
+    for field in ('latency', 'jitter', 'fail_rate', 'invalid_role_rate', 'http_error_rate', 'drop_rate', 'hang_rate', 'hang_seconds'):
+        parser.add_argument(f"--{field.replace('_', '-')}", type=float, default=getattr(defaults, field))
+    parser.add_argument('--http-status', type=int, default=defaults.http_status, help="status for --http-error-rate (e.g. 429, 500, 502, 503)")
+    parser.add_argument('--smile-points', type=int, default=defaults.smile_points)
+    parser.add_argument('--seed', type=int, help="random seed, for repeatable runs")
+    args = parser.parse_args()
+
+    settings = FakeSettings(**{field: getattr(args, field) for field in FakeSettings._fields})
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.INFO)
+    app = build_fake_app(settings)
+
+    async def log_stats(app):
+        logger.info(f"Fake Smile One stats: {dict(sorted(app['stats'].items()))}")
+
+    app.on_shutdown.append(log_stats)
+    print(f"Fake Smile One on http://{args.host}:{args.port} (regions: {', '.join(REGIONS)})")
+    web.run_app(app, host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+import pytest
+
+import db
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """The bot's collections on an in-memory mongomock database; skipped when mongomock-motor isn't installed."""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    import mongomock.collection
+
+    # Newer pymongo passes UpdateOne's `sort` option to bulk_write builders, which mongomock doesn't know
+    add_update = mongomock.collection.BulkOperationBuilder.add_update
+
+    def add_update_without_sort(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.collection.BulkOperationBuilder, "add_update", add_update_without_sort)
+    db.connect(mongomock_motor.AsyncMongoMockClient(tz_aware=True))
+    yield
+    db.close()
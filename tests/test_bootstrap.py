@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+import bot
+
+
+def test_failed_migration_stops_startup(monkeypatch):
+    async def broken_migration():
+        raise RuntimeError("0006_money_to_cents failed")
+
+    async def untouched():
+        raise AssertionError("indexes must not be built after a failed migration")
+
+    monkeypatch.setattr(bot, 'run_migrations', broken_migration)
+    monkeypatch.setattr(bot, 'ensure_indexes', untouched)
+    with pytest.raises(RuntimeError):
+        asyncio.run(bot.bootstrap_database())
+
+
+def test_failed_index_step_is_only_logged(monkeypatch):
+    ran = []
+
+    async def migrations():
+        ran.append('migrations')
+
+    async def broken_indexes():
+        raise RuntimeError("index build failed")
+
+    async def query_plans():
+        ran.append('query plans')
+
+    monkeypatch.setattr(bot, 'run_migrations', migrations)
+    monkeypatch.setattr(bot, 'ensure_indexes', broken_indexes)
+    monkeypatch.setattr(bot, 'check_query_plans', query_plans)
+    asyncio.run(bot.bootstrap_database())
+    assert ran == ['migrations', 'query plans']
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+
+from catalog import Catalog, CatalogError, format_cents, parse_rate_cents
+
+
+def region(*products, title="Prices"):
+    return {"title": title, "heading": "MLBB", "sections": [{"title": "Diamonds", "products": list(products)}]}
+
+
+def make_catalog(*br_products):
+    return Catalog({"ph": region({"name": "11", "ids": "1", "rate": "9.50"}), "br": region(*br_products)})
+
+
+def test_rates_parse_to_exact_cents():
+    assert parse_rate_cents("116.90") == 11690
+    assert parse_rate_cents(116.9) == 11690
+    assert parse_rate_cents("39") == 3900
+    assert format_cents(11690) == "116.90"
+    assert format_cents(-50) == "-0.50"
+
+
+@pytest.mark.parametrize("rate", ["0", "-1", "1.234", "abc"])
+def test_invalid_rates_are_rejected(rate):
+    with pytest.raises(CatalogError):
+        parse_rate_cents(rate)
+
+
+def test_products_are_looked_up_case_insensitively():
+    catalog = make_catalog({"name": "WKP", "ids": 16642, "rate": "76"}, {"name": "wkp2", "ids": [16642, 16642], "rate": "152"})
+    product = catalog.get("br", "wkp")
+    assert product.smile_ids == ("16642",)
+    assert product.rate_cents == 7600
+    assert not product.non_revert
+    assert catalog.get("br", "WKP2").smile_ids == ("16642", "16642")
+    assert catalog.get("ph", "wkp") is None
+    assert "wkp2: 152.00🪙" in catalog.price_list("br")
+
+
+@pytest.mark.parametrize("data", [
+    {"ph": region()},  # missing region
+    {"ph": region(), "br": region({"name": "11", "ids": "1", "rate": "1"}, {"name": "11", "ids": "2", "rate": "1"})},
+    {"ph": region(), "br": region({"name": "11", "ids": [], "rate": "1"})},
+    {"ph": region(), "br": region({"name": "11", "rate": "1"})},
+])
+def test_invalid_catalogs_are_rejected(data):
+    with pytest.raises(CatalogError):
+        Catalog(data)
+
+
+def test_component_weights_use_single_pack_prices():
+    catalog = make_catalog(
+        {"name": "55", "ids": "1", "rate": "39"},
+        {"name": "165", "ids": "2", "rate": "116.90"},
+        {"name": "cheap55", "ids": "1", "rate": "38"},
+        {"name": "220", "ids": ["1", "2"], "rate": "150"},
+        {"name": "mystery", "ids": ["1", "9"], "rate": "50"},
+    )
+    # The cheapest single-ID product sets the weight
+    assert catalog.component_weights(catalog.get("br", "220")) == (3800, 11690)
+    # A component that isn't sold on its own falls back to equal weights
+    assert catalog.component_weights(catalog.get("br", "mystery")) == (1, 1)
+
+
+def test_shipped_catalog_loads(tmp_path):
+    catalog = Catalog.load(str(Path(__file__).parent.parent / "catalog.json"))
+    assert catalog.products("ph") and catalog.products("br")
+    broken = tmp_path / "broken.json"
+    broken.write_text("[1, 2]")
+    with pytest.raises(CatalogError):
+        Catalog.load(str(broken))
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from bot import pack_records, parse_export_args
+
+
+def test_records_are_packed_without_splitting_them():
+    assert pack_records(["aaa", "bbb", "cc"], max_length=6) == ["aaabbb", "cc"]
+    assert pack_records([], max_length=6) == []
+
+
+def test_oversized_records_are_split_on_their_own():
+    assert pack_records(["ab", "cdefghij", "k"], max_length=4) == ["ab", "cdef", "ghij", "k"]
+
+
+def test_export_args_build_the_match():
+    export_format, match, sender = parse_export_args(["JSONL", "from=2026-10-01", "to=2026-10-02", "region=BR", "sender=@bob"])
+    assert export_format == "jsonl"
+    assert sender == "@bob"
+    assert match == {
+        # Myanmar days (UTC+6:30) as UTC bounds, `to` inclusive
+        "created_at": {"$gte": datetime(2026, 9, 30, 17, 30, tzinfo=timezone.utc),
+                       "$lt": datetime(2026, 10, 2, 17, 30, tzinfo=timezone.utc)},
+        "region": "br",
+    }
+
+
+def test_export_args_default_to_everything_as_csv():
+    assert parse_export_args([]) == ("csv", {}, None)
+
+
+@pytest.mark.parametrize("args", [["xml"], ["region=us"], ["from=yesterday"], ["limit=5"]])
+def test_bad_export_args_raise(args):
+    with pytest.raises(ValueError):
+        parse_export_args(args)
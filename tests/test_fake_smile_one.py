@@ -0,0 +1,78 @@
+"""createorder and getrole against fake_smile_one.py on a local port."""
+import asyncio
+import contextlib
+
+from aiohttp import web
+
+import bot
+from fake_smile_one import FakeSettings, build_fake_app
+
+
+@contextlib.asynccontextmanager
+async def fake_smile_one(**settings):
+    app = build_fake_app(FakeSettings(latency=0, seed=1, **settings))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    await bot.smile_one.start()
+    try:
+        yield f"http://127.0.0.1:{runner.addresses[0][1]}", app['stats']
+    finally:
+        await bot.smile_one.close()
+        await runner.cleanup()
+
+
+def create_order(base_url: str, fingerprint: str):
+    return bot.create_order_and_log("123", "456", "22590", f"{base_url}/br", fingerprint, "chat:1", "1")
+
+
+def test_order_is_placed_once_per_fingerprint(mongo):
+    async def scenario():
+        async with fake_smile_one() as (base_url, stats):
+            first = await create_order(base_url, "fp1")
+            again = await create_order(base_url, "fp1")  # e.g. the same command delivered twice
+            other = await create_order(base_url, "fp2")
+            attempt = await bot.order_attempts_collection.find_one({"_id": "fp1"})
+            return first, again, other, attempt, stats["br/createorder requests"]
+
+    first, again, other, attempt, requests = asyncio.run(scenario())
+    assert first["order_id"].startswith("FAKEBR")
+    assert again == first
+    assert other["order_id"] != first["order_id"]
+    assert (attempt["state"], attempt["order_id"], attempt["attempts"]) == ("confirmed", first["order_id"], 1)
+    assert requests == 2
+
+
+def test_rejected_order_keeps_smile_ones_reason(mongo):
+    async def scenario():
+        async with fake_smile_one(fail_rate=1) as (base_url, stats):
+            result = await create_order(base_url, "fp")
+            attempt = await bot.order_attempts_collection.find_one({"_id": "fp"})
+            return result, attempt
+
+    result, attempt = asyncio.run(scenario())
+    assert result == {"order_id": None, "reason": "Injected order failure"}
+    assert attempt["state"] == "failed"
+
+
+def test_dropped_connection_is_not_retried(mongo):
+    async def scenario():
+        async with fake_smile_one(drop_rate=1) as (base_url, stats):
+            result = await create_order(base_url, "fp")
+            attempt = await bot.order_attempts_collection.find_one({"_id": "fp"})
+            return result, attempt, stats["br/createorder requests"]
+
+    result, attempt, requests = asyncio.run(scenario())
+    # The request may have reached Smile One, so it is neither resent nor refunded
+    assert result["unknown"]
+    assert attempt["state"] == "unknown"
+    assert requests == 1
+
+
+def test_role_lookup(monkeypatch):
+    async def scenario():
+        async with fake_smile_one() as (base_url, stats):
+            monkeypatch.setattr(bot, "SMILE_ONE_BASE_URL_PH", f"{base_url}/ph")
+            return await bot.fetch_role_info("123", "456")
+
+    assert asyncio.run(scenario())["username"] == "Player123"
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+import bot
+
+
+@pytest.mark.parametrize("value, cents", [(116.9, 11690), (0.1 + 0.2, 30), (39.0, 3900), (-0.5, -50), (1.005, 101), (0.0, 0)])
+def test_legacy_cents_rounds_from_the_shortest_repr(value, cents):
+    assert bot.legacy_cents(value) == cents
+
+
+def test_money_migration_converts_doubles_once(mongo, monkeypatch):
+    async def rebuild_user_summaries():
+        return 0  # mongomock can't run the real rebuild ($reduce)
+
+    monkeypatch.setattr(bot, "rebuild_user_summaries", rebuild_user_summaries)
+
+    async def scenario():
+        await bot.users_collection.insert_many([
+            {"user_id": "1", "balance_ph": 116.9, "balance_br": 0.0,
+             "reservations": [{"key": "b1", "amount": 39.0}, {"key": "b2", "amount": 500}]},
+            {"user_id": "2", "balance_ph": 1000, "balance_br": 250},  # already in cents
+        ])
+        await bot.order_collection.insert_one({"total_cost": 77.8, "initial_balance": 194.7})
+        await bot.order_jobs_collection.insert_one({"_id": "j", "outcome": {"refund": 0.3, "charged": 116.9}})
+        await bot.daily_stats_collection.insert_one({"day": "2026-10-01", "spend": 77.8})
+        for _ in range(2):  # a restart mid-way must not convert anything twice
+            await bot.convert_money_to_cents()
+        users = {user['user_id']: user async for user in bot.users_collection.find()}
+        order = await bot.order_collection.find_one()
+        job = await bot.order_jobs_collection.find_one({"_id": "j"})
+        return users, order, job, await bot.daily_stats_collection.count_documents({})
+
+    users, order, job, stats = asyncio.run(scenario())
+    assert (users["1"]["balance_ph"], users["1"]["balance_br"]) == (11690, 0)
+    assert isinstance(users["1"]["balance_ph"], int)
+    assert [r["amount"] for r in users["1"]["reservations"]] == [3900, 500]
+    assert (users["2"]["balance_ph"], users["2"]["balance_br"]) == (1000, 250)
+    assert (order["total_cost"], order["initial_balance"]) == (7780, 19470)
+    assert job["outcome"] == {"refund": 30, "charged": 11690}
+    assert stats == 0  # rolled up again from the converted orders
@@ -0,0 +1,46 @@
+import pytest
+
+from bot import order_fingerprint, settle_order_line
+
+
+def line(rate_cents=15000, weights=(3800, 11690), non_revert=False):
+    return {"rate_cents": rate_cents, "component_weights": list(weights), "non_revert": non_revert}
+
+
+def test_fully_delivered_line_owes_nothing():
+    assert settle_order_line(line(), [{"order_id": "A"}, {"order_id": "B"}]) == (["A", "B"], None, 0)
+
+
+def test_partial_delivery_refunds_the_failed_share_by_weight():
+    order_ids, reason, refund = settle_order_line(line(), [{"order_id": "A"}, {"order_id": None, "reason": "Sold out"}])
+    assert (order_ids, reason) == (["A"], "Sold out")
+    assert refund == 15000 * 11690 // (3800 + 11690)
+
+
+def test_nothing_delivered_refunds_the_whole_rate():
+    results = [{"order_id": None, "reason": "Sold out"}, {"order_id": None, "reason": "Other"}]
+    assert settle_order_line(line(), results) == ([], "Sold out", 15000)
+
+
+def test_unknown_outcomes_are_not_refunded():
+    results = [{"order_id": None, "reason": "timeout", "unknown": True}, {"order_id": None, "reason": "Sold out"}]
+    assert settle_order_line(line(), results) == ([], "timeout", 15000 * 11690 // (3800 + 11690))
+    assert settle_order_line(line(weights=(1,)), [{"order_id": None, "unknown": True}])[2] == 0
+
+
+def test_non_revert_packs_are_never_refunded():
+    assert settle_order_line(line(non_revert=True), [{"order_id": None, "reason": "x"}, {"order_id": None}])[2] == 0
+
+
+def test_fingerprints_are_stable_and_distinct():
+    base = ("chat:42", 0, 0, "123", "456", "22590")
+    assert order_fingerprint(*base) == order_fingerprint(*base)
+    assert len(order_fingerprint(*base)) == 32
+    variants = [base[:i] + ("other",) + base[i + 1:] for i in range(len(base))]
+    assert len({order_fingerprint(*args) for args in [base, *variants]}) == len(variants) + 1
+
+
+@pytest.mark.parametrize("weights", [(1, 1, 1), (3800, 3800, 11690)])
+def test_refunds_never_exceed_the_rate(weights):
+    results = [{"order_id": None}] * len(weights)
+    assert settle_order_line(line(rate_cents=9999, weights=weights), results)[2] == 9999
@@ -0,0 +1,31 @@
+import asyncio
+import html
+from datetime import datetime, timezone
+
+import bot
+
+
+def test_migration_unescapes_stored_player_names(mongo, monkeypatch):
+    rebuilt = []
+
+    async def rebuild_user_summaries():
+        # mongomock can't run the real rebuild ($reduce)
+        rebuilt.append(True)
+        return 0
+
+    monkeypatch.setattr(bot, "rebuild_user_summaries", rebuild_user_summaries)
+
+    async def scenario():
+        now = datetime.now(timezone.utc)
+        await bot.order_collection.insert_many([
+            {"sender_user_id": "1", "user_id": "11", "username": html.escape("<Tom & Jerry>"), "created_at": now},
+            {"sender_user_id": "1", "user_id": "12", "username": "Plain", "created_at": now},
+        ])
+        await bot.order_jobs_collection.insert_one({"_id": "fp", "state": "pending", "order": {"username": html.escape("A&B")}})
+        await bot.unescape_order_usernames()
+        names = sorted([order['username'] async for order in bot.order_collection.find()])
+        job = await bot.order_jobs_collection.find_one({"_id": "fp"})
+        return names, job['order']['username']
+
+    assert asyncio.run(scenario()) == (["<Tom & Jerry>", "Plain"], "A&B")
+    assert rebuilt
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+
+from bot import CircuitBreaker, SmileOneUnavailable, TokenBucket
+
+
+def test_breaker_opens_once_enough_calls_failed():
+    breaker = CircuitBreaker("PH", window=10, min_calls=4, error_rate=0.5, cooldown=60)
+    breaker.before_call()
+    breaker.record_success()
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure(TimeoutError("slow"))
+    assert breaker.state == CircuitBreaker.CLOSED  # fewer than min_calls so far
+    breaker.before_call()
+    breaker.record_failure(TimeoutError("slow"))
+    assert breaker.state == CircuitBreaker.OPEN  # 3 of 4 failed
+    assert breaker.last_error == "slow"
+    with pytest.raises(SmileOneUnavailable):
+        breaker.before_call()
+    assert breaker.rejected == 1
+
+
+def opened_breaker():
+    breaker = CircuitBreaker("BR", window=4, min_calls=1, error_rate=0.5, cooldown=60)
+    breaker.record_failure(TimeoutError())
+    breaker._opened_at -= 60  # cooldown is over
+    return breaker
+
+
+def test_half_open_lets_one_trial_through_and_closes_on_success():
+    breaker = opened_breaker()
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(SmileOneUnavailable):
+        breaker.before_call()  # the trial is still running
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.current_error_rate == 0.0
+
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = opened_breaker()
+    breaker.before_call()
+    breaker.record_failure(TimeoutError())
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+
+
+def test_bucket_allows_the_burst_then_paces():
+    async def scenario():
+        bucket = TokenBucket(rate=20, burst=3)
+        started = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        burst_time = time.monotonic() - started
+        for _ in range(2):
+            await bucket.acquire()
+        return burst_time, time.monotonic() - started
+
+    burst_time, total_time = asyncio.run(scenario())
+    assert burst_time < 0.05
+    assert total_time >= 0.09  # two more tokens at 20/s
+
+
+def test_bucket_never_holds_more_than_the_burst():
+    bucket = TokenBucket(rate=1000, burst=2)
+    bucket._updated -= 10
+    assert bucket.tokens == 2
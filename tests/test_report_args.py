@@ -0,0 +1,37 @@
+import pytest
+
+from bot import REPORT_MAX_DAYS, parse_report_args
+
+TODAY = '2026-10-18'
+
+
+def test_defaults_to_today():
+    assert parse_report_args([], TODAY) == (TODAY, TODAY, None)
+
+
+def test_days_are_zero_padded():
+    assert parse_report_args(['from=2026-1-5', 'to=2026-1-9', 'region=PH'], TODAY) == ('2026-01-05', '2026-01-09', 'ph')
+
+
+def test_to_alone_is_a_single_day():
+    assert parse_report_args(['to=2026-1-5'], TODAY) == ('2026-01-05', '2026-01-05', None)
+
+
+def test_from_alone_runs_until_today():
+    assert parse_report_args(['from=2026-10-1'], TODAY) == ('2026-10-01', TODAY, None)
+
+
+def test_unpadded_period_is_still_limited():
+    with pytest.raises(ValueError, match=str(REPORT_MAX_DAYS)):
+        parse_report_args(['from=2026-1-5'], TODAY)
+
+
+@pytest.mark.parametrize('args', [
+    ['from=2026-02-01', 'to=2026-01-31'],
+    ['from=2026-13-01'],
+    ['region=us'],
+    ['last=7'],
+])
+def test_bad_options_are_rejected(args):
+    with pytest.raises(ValueError):
+        parse_report_args(args, TODAY)
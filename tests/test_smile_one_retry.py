@@ -0,0 +1,63 @@
+import asyncio
+import types
+
+import aiohttp
+import pytest
+
+from bot import SmileOneClient, SmileOneUnavailable, is_safe_to_retry
+
+CONNECTION_KEY = types.SimpleNamespace(host='www.smile.one', port=443, is_ssl=True, ssl=True)
+
+
+def response_error(status: int):
+    return aiohttp.ClientResponseError(None, (), status=status)
+
+
+@pytest.mark.parametrize('error', [
+    SmileOneUnavailable("circuit open"),
+    aiohttp.ConnectionTimeoutError("no connection in time"),
+    aiohttp.ClientConnectorError(CONNECTION_KEY, OSError(111, "Connection refused")),
+    aiohttp.ClientConnectorDNSError(CONNECTION_KEY, OSError(-2, "Name or service not known")),
+    response_error(429),
+    response_error(503),
+])
+def test_errors_before_the_request_was_sent_are_retried(error):
+    assert is_safe_to_retry(error)
+
+
+@pytest.mark.parametrize('error', [
+    aiohttp.ServerTimeoutError("timed out"),
+    aiohttp.SocketTimeoutError("read timed out"),
+    aiohttp.ServerDisconnectedError(),
+    response_error(500),
+    response_error(502),
+])
+def test_errors_after_the_request_may_have_been_sent_are_not_retried(error):
+    assert not is_safe_to_retry(error)
+
+
+def test_connection_timeout_keeps_its_type_through_post():
+    class Session:
+        closed = False
+
+        def post(self, endpoint, data):
+            raise aiohttp.ConnectionTimeoutError("no connection in time")
+
+    client = SmileOneClient()
+    client._session = Session()
+    with pytest.raises(aiohttp.ConnectionTimeoutError):
+        asyncio.run(client._post("https://www.smile.one/ph/smilecoin/api/createorder", {}))
+
+
+def test_other_timeouts_become_server_timeouts():
+    class Session:
+        closed = False
+
+        def post(self, endpoint, data):
+            raise asyncio.TimeoutError()
+
+    client = SmileOneClient()
+    client._session = Session()
+    with pytest.raises(aiohttp.ServerTimeoutError) as raised:
+        asyncio.run(client._post("https://www.smile.one/ph/smilecoin/api/createorder", {}))
+    assert not is_safe_to_retry(raised.value)
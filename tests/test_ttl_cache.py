@@ -0,0 +1,42 @@
+import asyncio
+
+from bot import AsyncTTLCache
+
+
+def test_invalidate_during_load_drops_the_stale_result():
+    async def scenario():
+        cache = AsyncTTLCache(ttl=60, negative_ttl=5, max_size=10)
+        release = asyncio.Event()
+        calls = []
+
+        async def load():
+            calls.append(True)
+            if len(calls) == 1:
+                await release.wait()
+                return None  # read before the user was registered
+            return True
+
+        stale = asyncio.ensure_future(cache.get("1", load))
+        await asyncio.sleep(0)
+        cache.invalidate("1")  # e.g. /registeruser while the first lookup is still running
+        fresh = await cache.get("1", load)
+        release.set()
+        return await stale, fresh, await cache.get("1", load), len(calls)
+
+    assert asyncio.run(scenario()) == (None, True, True, 2)
+
+
+def test_concurrent_lookups_share_one_load():
+    async def scenario():
+        cache = AsyncTTLCache(ttl=60, negative_ttl=5, max_size=10)
+        calls = []
+
+        async def load():
+            calls.append(True)
+            await asyncio.sleep(0)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get("k", load) for _ in range(5)))
+        return results, len(calls), cache.stats()['merged']
+
+    assert asyncio.run(scenario()) == (["value"] * 5, 1, 4)
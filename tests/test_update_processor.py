@@ -0,0 +1,57 @@
+import asyncio
+
+from telegram import Update
+
+from bot import PerUserUpdateProcessor
+
+
+def make_update(update_id: int, user_id: int) -> Update:
+    return Update.de_json({"update_id": update_id, "message": {
+        "message_id": update_id, "date": 0, "text": "/bal",
+        "chat": {"id": user_id, "type": "private"},
+        "from": {"id": user_id, "is_bot": False, "first_name": "Test"},
+    }}, None)
+
+
+def test_queued_updates_of_one_user_dont_block_other_users():
+    async def scenario():
+        processor = PerUserUpdateProcessor(2)
+        release_a = asyncio.Event()
+        b_done = asyncio.Event()
+
+        async def slow_a():
+            await release_a.wait()
+
+        async def fast_b():
+            b_done.set()
+
+        # More queued updates from A than there are slots; only the first one is running
+        tasks = [asyncio.create_task(processor.process_update(make_update(i, 1), slow_a())) for i in range(5)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(processor.process_update(make_update(10, 2), fast_b())))
+        try:
+            await asyncio.wait_for(b_done.wait(), 1)
+        finally:
+            release_a.set()
+            await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+
+def test_running_updates_are_bounded():
+    async def scenario():
+        processor = PerUserUpdateProcessor(2)
+        running = 0
+        peak = 0
+
+        async def handler():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(processor.process_update(make_update(i, i), handler()) for i in range(6)))
+        return peak
+
+    assert asyncio.run(scenario()) == 2
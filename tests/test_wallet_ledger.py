@@ -0,0 +1,92 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import bot
+
+HOUR_AGO = datetime.now(timezone.utc) - timedelta(hours=1)
+
+
+async def add_entry(user_id: str, amount: int, created_at: datetime, balance_type: str = "balance_ph"):
+    await bot.wallet_ledger_collection.insert_one({
+        "user_id": user_id, "balance_type": balance_type, "amount": amount, "balance_after": None,
+        "kind": "credit", "ref": {}, "created_at": created_at,
+    })
+
+
+def test_balance_at_sums_entries_up_to_then(mongo):
+    async def scenario():
+        await add_entry("1", 1000, HOUR_AGO - timedelta(minutes=30))
+        await add_entry("1", -250, HOUR_AGO - timedelta(minutes=10))
+        await add_entry("1", 500, HOUR_AGO + timedelta(minutes=10))
+        await add_entry("1", 9999, HOUR_AGO, balance_type="balance_br")
+        await add_entry("2", 9999, HOUR_AGO)
+        return (await bot.balance_at("1", "balance_ph", HOUR_AGO - timedelta(hours=1)),
+                await bot.balance_at("1", "balance_ph", HOUR_AGO),
+                await bot.balance_at("1", "balance_ph", datetime.now(timezone.utc)))
+
+    assert asyncio.run(scenario()) == (0, 750, 1250)
+
+
+def test_snapshots_cover_changed_wallets_once(mongo):
+    async def scenario():
+        await add_entry("1", 1000, HOUR_AGO)
+        await add_entry("1", -300, HOUR_AGO + timedelta(minutes=1))
+        await add_entry("2", 700, HOUR_AGO)
+        first = await bot.take_wallet_snapshots()
+        again = await bot.take_wallet_snapshots()
+        snapshots = {s['user_id']: s['balance'] async for s in bot.wallet_snapshots_collection.find()}
+        # Entries after the snapshot are added on top of it
+        await add_entry("1", 50, HOUR_AGO + timedelta(minutes=30))
+        third = await bot.take_wallet_snapshots()
+        latest = await bot.wallet_snapshots_collection.find_one({"user_id": "1"}, sort=[("ledger_id", -1)])
+        return first, again, snapshots, third, latest['balance'], await bot.balance_at("1", "balance_ph", datetime.now(timezone.utc))
+
+    first, again, snapshots, third, latest, balance = asyncio.run(scenario())
+    assert (first, again, third) == (2, 0, 1)
+    assert snapshots == {"1": 700, "2": 700}
+    assert latest == balance == 750
+
+
+def test_entries_written_in_the_last_minute_wait_for_the_next_snapshot(mongo):
+    async def scenario():
+        await add_entry("1", 1000, datetime.now(timezone.utc))
+        return await bot.take_wallet_snapshots()
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_balance_change_records_its_entry_and_drops_the_marker(mongo):
+    async def scenario():
+        await bot.users_collection.insert_one({"user_id": "1", "balance_ph": 100})
+        new_balance = await bot.update_balance("1", 250, "balance_ph", {"admin": 42})
+        entry = await bot.wallet_ledger_collection.find_one({"user_id": "1"})
+        user = await bot.users_collection.find_one({"user_id": "1"})
+        return new_balance, entry, user
+
+    new_balance, entry, user = asyncio.run(scenario())
+    assert new_balance == 350
+    assert (entry['kind'], entry['amount'], entry['balance_after'], entry['ref']) == ("credit", 250, 350, {"admin": 42})
+    assert user['pending_ledger'] == []
+
+
+def test_replay_records_entries_a_crash_left_pending(mongo):
+    async def scenario():
+        await add_entry("1", 1000, HOUR_AGO)
+        lost = bot.ledger_marker("balance_ph", -400, "reservation", {"batch": "7:1"}, key="reservation:7:1")
+        lost['created_at'] = HOUR_AGO + timedelta(minutes=1)
+        recorded = bot.ledger_marker("balance_ph", 1000, "credit", {"admin": 42})
+        recorded['created_at'] = HOUR_AGO
+        await bot.wallet_ledger_collection.update_one({}, {"$set": {"key": recorded['key']}})
+        fresh = bot.ledger_marker("balance_ph", 5, "credit", {"admin": 42})  # its write may still be running
+        await bot.users_collection.insert_one({"user_id": "1", "balance_ph": 605, "pending_ledger": [recorded, lost, fresh]})
+
+        replayed = await bot.replay_pending_ledger()
+        again = await bot.replay_pending_ledger()
+        entry = await bot.wallet_ledger_collection.find_one({"key": "reservation:7:1"})
+        user = await bot.users_collection.find_one({"user_id": "1"})
+        return replayed, again, entry, [marker['key'] for marker in user['pending_ledger']], fresh['key']
+
+    replayed, again, entry, pending, fresh_key = asyncio.run(scenario())
+    assert (replayed, again) == (1, 0)
+    assert (entry['amount'], entry['balance_after'], entry['ref']) == (-400, 600, {"batch": "7:1"})
+    assert pending == [fresh_key]
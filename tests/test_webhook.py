@@ -0,0 +1,8 @@
+import asyncio
+
+from webhook import webhook_self_test
+
+
+def test_webhook_self_test_passes():
+    # Accepts the sample updates, rejects a bad secret and a malformed payload, queues the accepted ones
+    assert asyncio.run(webhook_self_test())
@@ -0,0 +1,127 @@
+"""
+Embedded aiohttp server receiving Telegram updates by webhook (BOT_MODE=webhook), and its
+self-test. Only imported when the bot runs in webhook mode or with --webhook-self-test, so
+polling and tests don't pay for aiohttp.web.
+"""
+from typing import Final
+from telegram import Update
+from telegram.ext import Application
+from aiohttp import web
+import aiohttp
+import asyncio
+import hmac
+import logging
+import signal
+
+from config import WEBHOOK_URL, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_PATH, WEBHOOK_SECRET
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_SECRET_HEADER: Final = 'X-Telegram-Bot-Api-Secret-Token'
+
+
+def build_webhook_app(bot, update_queue: asyncio.Queue, path: str, secret: str) -> web.Application:
+    """aiohttp app that accepts Telegram updates on `path` and hands them to the update queue."""
+    async def receive_update(request: web.Request):
+        if secret and not hmac.compare_digest(request.headers.get(WEBHOOK_SECRET_HEADER, ''), secret):
+            logger.warning(f"Rejected webhook request from {request.remote}: bad secret token")
+            return web.Response(status=403)
+        try:
+            update = Update.de_json(await request.json(), bot)
+        except Exception as e:  # not JSON, or not an update
+            logger.warning(f"Rejected malformed webhook payload from {request.remote}: {e}")
+            return web.Response(status=400)
+        await update_queue.put(update)
+        return web.Response()  # answer right away, the update is handled in the background
+
+    async def health(request: web.Request):
+        return web.Response(text='ok')
+
+    webhook_app = web.Application()
+    webhook_app.router.add_post(path, receive_update)
+    webhook_app.router.add_get('/healthz', health)
+    return webhook_app
+
+
+async def run_webhook(application: Application):
+    """
+    Runs the bot behind the embedded webhook server until SIGINT/SIGTERM. Does by hand what
+    run_polling does for us: initialize, post_init, start, and the reverse on the way out.
+    """
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+    runner = web.AppRunner(build_webhook_app(application.bot, application.update_queue, WEBHOOK_PATH, WEBHOOK_SECRET))
+    await runner.setup()
+    try:
+        await application.start()
+        await web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT).start()
+        await application.bot.set_webhook(
+            url=WEBHOOK_URL.rstrip('/') + WEBHOOK_PATH,
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=Update.ALL_TYPES,
+        )
+        logger.info(f"Webhook server listening on {WEBHOOK_HOST}:{WEBHOOK_PORT}{WEBHOOK_PATH}")
+        await stop_event.wait()
+    finally:
+        # The webhook is left registered so Telegram holds updates until the bot is back
+        await runner.cleanup()
+        if application.running:
+            await application.stop()
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+
+
+SELF_TEST_UPDATES: Final = [
+    {"update_id": 1, "message": {
+        "message_id": 1, "date": 0, "text": "/getid",
+        "chat": {"id": 1, "type": "private"},
+        "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+        "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+    }},
+    {"update_id": 2, "callback_query": {
+        "id": "1", "chat_instance": "1", "data": "his:u:o:000000000000000000000000",
+        "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+    }},
+]
+
+
+async def webhook_self_test() -> bool:
+    """Posts sample updates to a local webhook server and checks each is accepted or rejected as expected."""
+    secret = WEBHOOK_SECRET or 'self-test'
+    update_queue = asyncio.Queue()
+    runner = web.AppRunner(build_webhook_app(None, update_queue, WEBHOOK_PATH, secret))
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    url = f"http://127.0.0.1:{runner.addresses[0][1]}{WEBHOOK_PATH}"
+
+    cases = [(f"update {sample['update_id']}", sample, secret, 200) for sample in SELF_TEST_UPDATES]
+    cases += [
+        ("wrong secret", SELF_TEST_UPDATES[0], 'wrong', 403),
+        ("malformed payload", "not json", secret, 400),
+    ]
+    passed = True
+    try:
+        async with aiohttp.ClientSession() as session:
+            for name, payload, token, expected in cases:
+                kwargs = {'json': payload} if isinstance(payload, dict) else {'data': payload}
+                async with session.post(url, headers={WEBHOOK_SECRET_HEADER: token}, **kwargs) as response:
+                    ok = response.status == expected
+                passed = passed and ok
+                print(f"{'PASS' if ok else 'FAIL'} {name}: HTTP {response.status} (expected {expected})")
+    finally:
+        await runner.cleanup()
+
+    queued = [update_queue.get_nowait().update_id for _ in range(update_queue.qsize())]
+    ok = queued == [sample['update_id'] for sample in SELF_TEST_UPDATES]
+    print(f"{'PASS' if ok else 'FAIL'} queued updates: {queued}")
+    return passed and ok